@@ -1,6 +1,6 @@
 import asyncio
 
-from parse import WaybackTweetsParser
+from async_wayback_twitter.parse import WaybackTweetsParser
 from async_wayback_twitter.wayback import WaybackTweets
 
 USERNAME = "jk_rowling"
@@ -9,27 +9,30 @@ async def main():
     # Instantiate the API with the given username.
     api = WaybackTweets(USERNAME)
     
-    # Asynchronously fetch the archived tweets from the Wayback Machine.
-    # (This assumes that the get() method is implemented as an async function.)
-    archived_tweets =  api.get_tweets()
-    
-    if archived_tweets:
-        field_options = [
-            "archived_timestamp",
-            "original_tweet_url",
-            "archived_tweet_url",
-            "archived_statuscode",
-        ]
-        
-        # Instantiate the TweetsParser with the archived tweets data.
-        parser = WaybackTweetsParser(archived_tweets, USERNAME, field_options)
-        
-        # Asynchronously iterate over each parsed tweet record.
-        async for tweet_record in parser.parse():
-            print(tweet_record)
-    else:
+    # Stream the archived tweets from the Wayback Machine. get_tweets() is an async
+    # generator, so records are parsed as they arrive rather than after the full download.
+    archived_tweets = api.get_tweets()
+
+    field_options = [
+        "archived_timestamp",
+        "original_tweet_url",
+        "archived_tweet_url",
+        "archived_statuscode",
+    ]
+
+    # Instantiate the TweetsParser with the archived tweets data.
+    parser = WaybackTweetsParser(archived_tweets, USERNAME, field_options)
+
+    # Asynchronously iterate over each parsed tweet record.
+    found = False
+    async for tweet_record in parser.parse():
+        found = True
+        print(tweet_record)
+
+    if not found:
         print("No archived tweets were found.")
 
 
+# Run as a module so the package imports resolve: python -m async_wayback_twitter.main
 if __name__ == "__main__":
     asyncio.run(main())
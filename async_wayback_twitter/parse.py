@@ -1,24 +1,45 @@
-from urllib.parse import unquote, urlparse
+from urllib.parse import unquote
 from html import unescape
 import re
 import traceback
+from collections import OrderedDict
+from concurrent.futures import Executor
 import aiohttp
 import asyncio
-from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
-from rich import print as rprint
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set, Tuple
 from async_wayback_twitter.utils import (
     check_double_status,
     check_pattern_tweet,
-    check_url_scheme,
     clean_tweet_url,
+    create_session,
     delete_tweet_pathnames,
+    encode_url,
+    get_tweet_id,
     is_tweet_url,
+    json_loads,
     semicolon_parser,
     timestamp_parser,
+    url_path,
 )
 
 VERBOSE = True
 
+_EMBED_RE = re.compile(
+    r'(?s)<blockquote class="twitter-tweet"(?: [^>]+)?><p[^>]*>(.*?)<\/p>.*?&mdash;\s*(.*?)<\/a>'
+)
+_AUTHOR_RE = re.compile(r"^(.*?)\s*\(")
+_ANCHOR_RE = re.compile(r"<a[^>]*>|<\/a>")
+
+# rich is an optional extra that only colours the error messages; without it the
+# leading colour tag is dropped and the message is printed plainly.
+try:
+    from rich import print as rprint
+except ImportError:
+    _COLOUR_TAG_RE = re.compile(r"^\[(?:red|yellow)\]")
+
+    def rprint(*objects: Any) -> None:  # type: ignore[misc]
+        print(*(_COLOUR_TAG_RE.sub("", str(obj)) for obj in objects))
+
 
 class JsonParser:
     """
@@ -28,10 +49,12 @@ class JsonParser:
 
     Args:
         archived_tweet_url (str): The URL of the archived tweet to be parsed.
+        session (aiohttp.ClientSession): The shared session used to issue the request.
     """
 
-    def __init__(self, archived_tweet_url: str):
+    def __init__(self, archived_tweet_url: str, session: aiohttp.ClientSession):
         self.archived_tweet_url = archived_tweet_url
+        self.session = session
 
     async def parse(self) -> Optional[str]:
         """
@@ -41,10 +64,9 @@ class JsonParser:
             The parsed tweet text, or None if parsing fails.
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.archived_tweet_url) as response:
-                    response.raise_for_status()
-                    json_data = await response.json()
+            async with self.session.get(self.archived_tweet_url) as response:
+                response.raise_for_status()
+                json_data = await response.json(loads=json_loads)
 
             # Attempt to extract the tweet text based on available keys.
             if "data" in json_data:
@@ -71,8 +93,9 @@ class JsonParser:
 async def main():
     # Replace the URL with a valid archived tweet URL returning JSON.
     archived_url = "https://example.com/path/to/archived/tweet.json"
-    parser = JsonParser(archived_url)
-    tweet_text = await parser.parse()
+    async with create_session() as session:
+        parser = JsonParser(archived_url, session)
+        tweet_text = await parser.parse()
 
     if tweet_text:
         print("Parsed Tweet Text:", tweet_text)
@@ -90,10 +113,12 @@ class TwitterEmbed:
 
     Args:
         tweet_url (str): The URL of the tweet to be parsed.
+        session (aiohttp.ClientSession): The shared session used to issue the request.
     """
 
-    def __init__(self, tweet_url: str):
+    def __init__(self, tweet_url: str, session: aiohttp.ClientSession):
         self.tweet_url = tweet_url
+        self.session = session
 
     async def embed(self) -> Optional[Tuple[List[str], List[bool], List[str]]]:
         """
@@ -108,49 +133,40 @@ class TwitterEmbed:
         """
         url = f"https://publish.twitter.com/oembed?url={self.tweet_url}"
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    response.raise_for_status()
-                    json_response = await response.json()
+            async with self.session.get(url) as response:
+                response.raise_for_status()
+                json_response = await response.json(loads=json_loads)
 
             # Extract the embed HTML and author name.
             html_content = json_response.get("html", "")
             author_name = json_response.get("author_name", "")
 
-            # Use regex to extract tweet content and user info.
-            # The regex matches the tweet text inside a <p> tag and the user information following the em dash.
-            regex = re.compile(
-                r'<blockquote class="twitter-tweet"(?: [^>]+)?><p[^>]*>(.*?)<\/p>.*?&mdash;\s*(.*?)<\/a>',
-                re.DOTALL,
-            )
-            regex_author = re.compile(r"^(.*?)\s*\(")
-
-            matches_html = regex.findall(html_content)
-            if not matches_html:
-                return None
-
             tweet_contents: List[str] = []
             user_infos: List[str] = []
             is_retweet_flags: List[bool] = []
 
-            for match in matches_html:
+            # Use regex to extract tweet content and user info.
+            # The regex matches the tweet text inside a <p> tag and the user information following the em dash.
+            for match in _EMBED_RE.finditer(html_content):
                 # Remove any anchor tags from the tweet text.
-                tweet_content_raw = re.sub(r"<a[^>]*>|<\/a>", "", match[0].strip())
+                tweet_content_raw = _ANCHOR_RE.sub("", match.group(1).strip())
                 # Replace HTML break tags with newlines and unescape HTML entities.
                 tweet_content_clean = unescape(tweet_content_raw.replace("<br>", "\n"))
 
                 # Remove any anchor tags from the user info.
-                user_info_raw = re.sub(r"<a[^>]*>|<\/a>", "", match[1].strip())
+                user_info_raw = _ANCHOR_RE.sub("", match.group(2).strip())
                 user_info_clean = unescape(user_info_raw)
 
                 # Extract the author from the user info (before the first parenthesis).
-                match_author = regex_author.search(user_info_clean)
+                match_author = _AUTHOR_RE.search(user_info_clean)
                 author_from_tweet = match_author.group(1) if match_author else ""
 
                 tweet_contents.append(tweet_content_clean)
                 user_infos.append(user_info_clean)
                 is_retweet_flags.append(author_name != author_from_tweet)
 
+            if not tweet_contents:
+                return None
             return tweet_contents, is_retweet_flags, user_infos
 
         except aiohttp.ClientError as e:
@@ -163,6 +179,163 @@ class TwitterEmbed:
         return None
 
 
+class _EmbedCache:
+    """
+    Caches TwitterEmbed results by tweet id for the duration of a parse.
+
+    Snapshots of the same tweet share one Publish API request: concurrent lookups for
+    an id await the same in-flight task, and later lookups reuse its result. A failed
+    lookup is not kept, so a later snapshot of the tweet fetches it again.
+
+    Args:
+        session (aiohttp.ClientSession): The shared session used for embed requests.
+        maxsize (int): The maximum number of tweet ids to keep, least recently used first out.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, maxsize: int = 10000):
+        self.session = session
+        self.maxsize = maxsize
+        self._tasks: "OrderedDict[str, asyncio.Task]" = OrderedDict()
+        # Every unfinished fetch, including ones already evicted from _tasks.
+        self._pending: Set[asyncio.Task] = set()
+
+    async def embed(
+        self, tweet_url: str
+    ) -> Optional[Tuple[List[str], List[bool], List[str]]]:
+        """
+        Returns the TwitterEmbed result for a tweet URL, fetching it at most once per tweet id.
+        """
+        tweet_id = get_tweet_id(tweet_url)
+        if tweet_id is None:
+            return await TwitterEmbed(tweet_url, self.session).embed()
+
+        task = self._tasks.get(tweet_id)
+        if task is None:
+            task = asyncio.ensure_future(TwitterEmbed(tweet_url, self.session).embed())
+            self._tasks[tweet_id] = task
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+            task.add_done_callback(lambda done: self._forget_failure(tweet_id, done))
+            if len(self._tasks) > self.maxsize:
+                self._tasks.popitem(last=False)
+        else:
+            self._tasks.move_to_end(tweet_id)
+
+        # Shield the shared task so one cancelled caller doesn't cancel it for the others.
+        return await asyncio.shield(task)
+
+    def _forget_failure(self, tweet_id: str, task: asyncio.Task) -> None:
+        """
+        Drops a failed lookup from the cache once it finishes, so the next snapshot of the
+        tweet fetches it again; lookups already awaiting the task still share its result.
+        """
+        if task.cancelled() or task.exception() is not None or task.result() is None:
+            if self._tasks.get(tweet_id) is task:
+                del self._tasks[tweet_id]
+
+    async def close(self) -> None:
+        """
+        Cancels the unfinished embed fetches and waits for them to stop, so none outlive
+        the session they were started on.
+        """
+        pending = list(self._pending)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _run_sync(executor: Optional[Executor], func, *args):
+    """
+    Calls `func(*args)` inline, or in `executor` when one is given.
+    """
+    if executor is None:
+        return func(*args)
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+
+async def _add_embed(tweet_record: Dict[str, Any], embeds: _EmbedCache) -> None:
+    """
+    Fills in the available_tweet_* fields of a record from the tweet's embed data.
+    """
+    encoded_tweet = tweet_record["original_tweet_url"]
+
+    # If the tweet URL looks like a valid Twitter status URL, attempt to fetch its embed data.
+    if not is_tweet_url(encoded_tweet):
+        return
+    content = await embeds.embed(encoded_tweet)
+    if content:
+        # Assume content is a tuple of lists, where we take the first element of each.
+        tweet_record["available_tweet_text"] = semicolon_parser(content[0][0])
+        tweet_record["available_tweet_is_RT"] = content[1][0]
+        tweet_record["available_tweet_info"] = semicolon_parser(content[2][0])
+
+
+async def _iterate(responses) -> AsyncGenerator[Dict[str, str], None]:
+    """
+    Iterates over either an async iterable or a plain iterable of response records.
+    """
+    if hasattr(responses, "__aiter__"):
+        async for response in responses:
+            yield response
+    else:
+        for response in responses:
+            yield response
+
+
+def _completed_records(
+    done: Set["asyncio.Task[Optional[Dict[str, Any]]]"],
+) -> List[Dict[str, Any]]:
+    """
+    Collects the records of finished tasks, reporting any task that raised.
+    """
+    records = []
+    for task in done:
+        e = task.exception()
+        if e is not None:
+            if VERBOSE:
+                traceback.print_exception(type(e), e, e.__traceback__)
+                rprint(f"[red][Error] Processing tweet record failed: {e}")
+            continue
+        tweet_record = task.result()
+        if tweet_record is not None:
+            records.append(tweet_record)
+    return records
+
+
+async def _process_concurrently(
+    process, responses, embeds: _EmbedCache, max_in_flight: int
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """
+    Runs `process(response, embeds)` for each response with at most `max_in_flight`
+    records outstanding, yielding parsed records in completion order.
+
+    Args:
+        process: The coroutine function that parses a single response record.
+        responses: An async or plain iterable of response records.
+        embeds (_EmbedCache): The shared embed cache passed to `process`.
+        max_in_flight (int): The maximum number of records processed at once.
+    """
+    tasks: Set["asyncio.Task[Optional[Dict[str, Any]]]"] = set()
+    try:
+        async for response in _iterate(responses):
+            tasks.add(asyncio.create_task(process(response, embeds)))
+            if len(tasks) >= max_in_flight:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for tweet_record in _completed_records(done):
+                    yield tweet_record
+
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for tweet_record in _completed_records(done):
+                yield tweet_record
+    finally:
+        # The consumer may stop early; don't leave orphaned requests running.
+        for task in tasks:
+            task.cancel()
+
+
 class WaybackTweetsParser:
     """
     Asynchronously parses archived tweets data from the Wayback CDX API.
@@ -172,44 +345,82 @@ class WaybackTweetsParser:
             The first row may be a header. In this example we assume that each tweet record is a dictionary.
         username (str): The Twitter username associated with the tweets.
         field_options (List[str]): The fields to be included in the parsed tweet record.
+        max_in_flight (int): The maximum number of records processed concurrently.
+        executor (Executor, optional): An executor to run the per-record URL cleaning in,
+            keeping it off the event loop. By default it runs inline, which is cheaper
+            than a thread hand-off for these short string operations under the GIL.
     """
 
     def __init__(
-        self, archived_tweets_response, username: str, field_options: List[str]
+        self,
+        archived_tweets_response,
+        username: str,
+        field_options: List[str],
+        max_in_flight: int = 32,
+        executor: Optional[Executor] = None,
     ):
         # archived_tweets_response can be a list of lists or a list of dictionaries.
         self.archived_tweets_response = archived_tweets_response
         self.username = username
         self.field_options = field_options
-        self.path_urls = set()
-
-    async def _process_response(self, response: Dict[str, str]) -> Dict[str, Any]:
+        self.max_in_flight = max_in_flight
+        self.executor = executor
+        # Seen paths are stored by their 64-bit string hash rather than as strings,
+        # which keeps memory low for accounts with very many snapshots.
+        self.path_urls: Set[int] = set()
+
+    async def _process_response(
+        self, response: Dict[str, str], embeds: _EmbedCache
+    ) -> Optional[Dict[str, Any]]:
         """
         Processes a single archived tweet response (as a dict) and returns a dictionary of parsed fields.
 
         Args:
             response (Dict[str, str]): A single tweet record from the archived response.
+            embeds (_EmbedCache): The shared cache used to fetch embed data.
 
         Returns:
-            Dict[str, Any]: A dictionary containing parsed tweet fields.
+            Dict[str, Any]: A dictionary containing parsed tweet fields, or None if the
+            record is skipped.
         """
-        print(f"Processing response: {response}")
-        if "original" not in response:
-            return None
-        if "statuscode" not in response:
+        # Reject non-200 and already-seen records before doing any URL work.
+        if "original" not in response or "statuscode" not in response:
             return None
-        elif response["statuscode"] != "200":
+        if response["statuscode"] != "200":
             return None
-        o = urlparse(response["original"])
-        if o.path in self.path_urls:
+        path = hash(url_path(response["original"]))
+        if path in self.path_urls:
             return None
+        # Claim the path now so concurrently scheduled snapshots of it are skipped.
+        self.path_urls.add(path)
+
+        tweet_record = await _run_sync(self.executor, self._prepare_record, response)
+        self.path_urls.add(hash(url_path(tweet_record["parsed_tweet_url"])))
+
+        await _add_embed(tweet_record, embeds)
+        return tweet_record
+
+    def _prepare_record(self, response: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Builds the parsed fields of an archived tweet record that don't need network access.
+
+        This only reads the response and the username, so it is safe to run in a worker thread.
 
-        # Use dictionary keys rather than index positions.
-        tweet_remove_char = unquote(response["original"]).replace("’", "")
+        Args:
+            response (Dict[str, str]): A single tweet record from the archived response.
+
+        Returns:
+            Dict[str, Any]: The tweet record, with the available_tweet_* fields set to None.
+        """
+        # Look up each field once and use dictionary keys rather than index positions.
+        original = response["original"]
+        timestamp = response["timestamp"]
+
+        tweet_remove_char = unquote(original).replace("’", "")
         cleaned_tweet = check_pattern_tweet(tweet_remove_char).strip('"')
 
         # Build the original Wayback Machine URL.
-        wayback_machine_url = f"https://web.archive.org/web/{response['timestamp']}/{response['original']}"
+        wayback_machine_url = f"https://web.archive.org/web/{timestamp}/{original}"
         original_tweet = delete_tweet_pathnames(
             clean_tweet_url(cleaned_tweet, self.username)
         )
@@ -223,42 +434,23 @@ class WaybackTweetsParser:
         elif "://" not in original_tweet:
             original_tweet = delete_tweet_pathnames(f"https://{original_tweet}")
 
-        # Create a parsed version of the Wayback Machine URL.
-        parsed_wayback_machine_url = (
-            f"https://web.archive.org/web/{response['timestamp']}/{original_tweet}"
+        # Encode each tweet URL once and prefix the encoded form; the Wayback Machine
+        # prefix never needs encoding itself.
+        encoded_tweet = encode_url(original)
+        encoded_parsed_tweet = encode_url(original_tweet)
+        encoded_archived_tweet = f"https://web.archive.org/web/{timestamp}/{encoded_tweet}"
+        encoded_parsed_archived_tweet = (
+            f"https://web.archive.org/web/{timestamp}/{encoded_parsed_tweet}"
         )
-        encoded_archived_tweet = check_url_scheme(semicolon_parser(wayback_machine_url))
-        encoded_parsed_archived_tweet = check_url_scheme(
-            semicolon_parser(parsed_wayback_machine_url)
-        )
-        encoded_tweet = check_url_scheme(semicolon_parser(response["original"]))
-        encoded_parsed_tweet = check_url_scheme(semicolon_parser(original_tweet))
-        o = urlparse(encoded_parsed_tweet)
-        self.path_urls.add(o.path)
-
-        # Initialize fields for available tweet information.
-        available_tweet_text: Optional[str] = None
-        available_tweet_is_RT: Optional[bool] = None
-        available_tweet_info: Optional[str] = None
-
-        # If the tweet URL looks like a valid Twitter status URL, attempt to fetch its embed data.
-        if is_tweet_url(encoded_tweet):
-            embed_parser = TwitterEmbed(encoded_tweet)
-            content = await embed_parser.embed()
-            if content:
-                # Assume content is a tuple of lists, where we take the first element of each.
-                available_tweet_text = semicolon_parser(content[0][0])
-                available_tweet_is_RT = content[1][0]
-                available_tweet_info = semicolon_parser(content[2][0])
 
         # Build the tweet record as a dictionary.
         tweet_record = {
-            "available_tweet_text": available_tweet_text,
-            "available_tweet_is_RT": available_tweet_is_RT,
-            "available_tweet_info": available_tweet_info,
+            "available_tweet_text": None,
+            "available_tweet_is_RT": None,
+            "available_tweet_info": None,
             "archived_urlkey": response["urlkey"],
-            "archived_timestamp": response["timestamp"],
-            "parsed_archived_timestamp": timestamp_parser(response["timestamp"]),
+            "archived_timestamp": timestamp,
+            "parsed_archived_timestamp": timestamp_parser(timestamp),
             "archived_tweet_url": encoded_archived_tweet,
             "parsed_archived_tweet_url": encoded_parsed_archived_tweet,
             "original_tweet_url": encoded_tweet,
@@ -273,16 +465,22 @@ class WaybackTweetsParser:
     async def parse(self) -> AsyncGenerator[Dict[str, Any], None]:
         responses = self.archived_tweets_response
 
-        # Check if responses is an async generator by looking for the __aiter__ attribute.
-        async for response in responses:
+        # One session for the whole stream so embed requests reuse pooled connections.
+        # The path_urls check and insert in _process_response happen before its first
+        # await, so concurrent tasks still deduplicate in arrival order without a lock.
+        # (With an executor, the parsed-path insert happens after the worker returns.)
+        async with create_session() as session:
+            embeds = _EmbedCache(session)
             try:
-                tweet_record = await self._process_response(response)
-                if tweet_record is None:
-                    continue
-                yield tweet_record
-            except Exception as e:
-                traceback.print_exc()
-                print(f"[Error] Processing tweet record failed: {e}")
+                async for tweet_record in _process_concurrently(
+                    self._process_response,
+                    responses,
+                    embeds,
+                    self.max_in_flight,
+                ):
+                    yield tweet_record
+            finally:
+                await embeds.close()
 
 
 class CommonCrawlTweetsParser:
@@ -294,25 +492,49 @@ class CommonCrawlTweetsParser:
             The raw response records from Common Crawl. Each record is expected to be a dictionary.
         username (str): The Twitter username associated with the tweets.
         field_options (List[str]): The fields to be included in the parsed tweet record.
+        max_in_flight (int): The maximum number of records processed concurrently.
+        executor (Executor, optional): An executor to run the per-record URL cleaning in,
+            keeping it off the event loop. By default it runs inline, which is cheaper
+            than a thread hand-off for these short string operations under the GIL.
     """
 
-    def __init__(self, common_crawl_response, username: str, field_options: List[str]):
+    def __init__(
+        self,
+        common_crawl_response,
+        username: str,
+        field_options: List[str],
+        max_in_flight: int = 32,
+        executor: Optional[Executor] = None,
+    ):
         self.common_crawl_response = common_crawl_response
         self.username = username
         self.field_options = field_options
+        self.max_in_flight = max_in_flight
+        self.executor = executor
 
-    async def _process_response(self, response: Dict[str, str]) -> Dict[str, Any]:
+    async def _process_response(
+        self, response: Dict[str, str], embeds: _EmbedCache
+    ) -> Dict[str, Any]:
         """
         Process a single Common Crawl tweet record and return a dictionary of parsed fields.
         """
+        tweet_record = await _run_sync(self.executor, self._prepare_record, response)
+        await _add_embed(tweet_record, embeds)
+        return tweet_record
+
+    def _prepare_record(self, response: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Build the parsed fields of a Common Crawl tweet record that don't need network access.
+        """
         # For Common Crawl, we assume the captured URL is stored under 'url'
-        tweet_remove_char = unquote(response["url"]).replace("’", "")
+        url = response["url"]
+        timestamp = response["timestamp"]
+
+        tweet_remove_char = unquote(url).replace("’", "")
         cleaned_tweet = check_pattern_tweet(tweet_remove_char).strip('"')
 
         # Build a representative Common Crawl URL (this can be adjusted as needed)
-        common_crawl_url = (
-            f"https://commoncrawl.org/{response['timestamp']}/{response['url']}"
-        )
+        common_crawl_url = f"https://commoncrawl.org/{timestamp}/{url}"
         original_tweet = delete_tweet_pathnames(
             clean_tweet_url(cleaned_tweet, self.username)
         )
@@ -326,38 +548,21 @@ class CommonCrawlTweetsParser:
         elif "://" not in original_tweet:
             original_tweet = delete_tweet_pathnames(f"https://{original_tweet}")
 
-        # Create parsed URLs.
-        parsed_common_crawl_url = (
-            f"https://commoncrawl.org/{response['timestamp']}/{original_tweet}"
-        )
-        encoded_common_crawl_url = check_url_scheme(semicolon_parser(common_crawl_url))
-        encoded_parsed_common_crawl_url = check_url_scheme(
-            semicolon_parser(parsed_common_crawl_url)
+        # Encode each tweet URL once and prefix the encoded form.
+        encoded_tweet = encode_url(url)
+        encoded_parsed_tweet = encode_url(original_tweet)
+        encoded_common_crawl_url = f"https://commoncrawl.org/{timestamp}/{encoded_tweet}"
+        encoded_parsed_common_crawl_url = (
+            f"https://commoncrawl.org/{timestamp}/{encoded_parsed_tweet}"
         )
-        encoded_tweet = check_url_scheme(semicolon_parser(response["url"]))
-        encoded_parsed_tweet = check_url_scheme(semicolon_parser(original_tweet))
-
-        # Initialize additional tweet fields.
-        available_tweet_text: Optional[str] = None
-        available_tweet_is_RT: Optional[bool] = None
-        available_tweet_info: Optional[str] = None
-
-        # Attempt to fetch embed data if the URL looks like a valid Twitter status URL.
-        if is_tweet_url(encoded_tweet):
-            embed_parser = TwitterEmbed(encoded_tweet)
-            content = await embed_parser.embed()
-            if content:
-                available_tweet_text = semicolon_parser(content[0][0])
-                available_tweet_is_RT = content[1][0]
-                available_tweet_info = semicolon_parser(content[2][0])
 
         tweet_record = {
-            "available_tweet_text": available_tweet_text,
-            "available_tweet_is_RT": available_tweet_is_RT,
-            "available_tweet_info": available_tweet_info,
-            "common_crawl_url": response["url"],
-            "common_crawl_timestamp": response["timestamp"],
-            "parsed_common_crawl_timestamp": timestamp_parser(response["timestamp"]),
+            "available_tweet_text": None,
+            "available_tweet_is_RT": None,
+            "available_tweet_info": None,
+            "common_crawl_url": url,
+            "common_crawl_timestamp": timestamp,
+            "parsed_common_crawl_timestamp": timestamp_parser(timestamp),
             "common_crawl_tweet_url": encoded_common_crawl_url,
             "parsed_common_crawl_tweet_url": encoded_parsed_common_crawl_url,
             "original_tweet_url": encoded_tweet,
@@ -375,24 +580,18 @@ class CommonCrawlTweetsParser:
         """
         responses = self.common_crawl_response
 
-        # Check if responses is an async iterable.
-        if hasattr(responses, "__aiter__"):
-            async for response in responses:
-                try:
-                    tweet_record = await self._process_response(response)
-                    yield tweet_record
-                except Exception as e:
-                    traceback.print_exc()
-                    rprint(f"[Error] Processing tweet record failed: {e}")
-        else:
-            # Assume responses is a synchronous iterable.
-            for response in responses:
-                try:
-                    tweet_record = await self._process_response(response)
+        async with create_session() as session:
+            embeds = _EmbedCache(session)
+            try:
+                async for tweet_record in _process_concurrently(
+                    self._process_response,
+                    responses,
+                    embeds,
+                    self.max_in_flight,
+                ):
                     yield tweet_record
-                except Exception as e:
-                    traceback.print_exc()
-                    rprint(f"[Error] Processing tweet record failed: {e}")
+            finally:
+                await embeds.close()
 
 
 # Example usage of the asynchronous TweetsParser.
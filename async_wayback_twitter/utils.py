@@ -5,27 +5,85 @@ Utility functions for handling HTTP requests and manipulating URLs.
 import html
 import re
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Callable, Optional, Union
 
 import aiohttp
 import asyncio
-
-class EmptyResponseError:
+import orjson
+
+# orjson decodes JSON response bodies several times faster than the json module.
+json_loads: Callable[[Union[str, bytes]], Any] = orjson.loads
+
+# Patterns are compiled once at import time; they run several times per archived record.
+_STATUS_RE = re.compile(r"/status/(\d+)")
+_PATTERN_TWEET_RE = re.compile(
+    r'/status/((?:"(.*?)"|&quot;(.*?)(?=&|$)|&quot%3B(.*?)(?=&|$)))'
+)
+_USERNAME_RE = re.compile(r"https://twitter\.com/([^/]+)/status/\d+")
+_ID_RE = re.compile(r"https://twitter.com/\w+/status/(\d+)")
+_URL_SCHEME_RE = re.compile(r"(http:|https:)/{3,}")
+
+# Wayback timestamps are YYYY[MM[DD[HH[MM[SS]]]]], so the length alone selects the format.
+_TIMESTAMP_FORMATS = {
+    4: "%Y",
+    6: "%Y%m",
+    8: "%Y%m%d",
+    10: "%Y%m%d%H",
+    12: "%Y%m%d%H%M",
+    14: "%Y%m%d%H%M%S",
+}
+
+# Gateway errors from the archive are usually transient and worth retrying.
+_RETRY_STATUSES = frozenset({502, 503, 504})
+
+class EmptyResponseError(Exception):
     pass
-class ReadTimeoutError:
+class ReadTimeoutError(Exception):
     pass
-class HTTPError:
+class HTTPError(Exception):
     pass
-class GetResponseError:
+class GetResponseError(Exception):
     pass
 
-async def get_response(url: str, params: Optional[dict] = None) -> dict:
+
+def create_session() -> aiohttp.ClientSession:
+    """
+    Creates an aiohttp session with a pooled keep-alive connector.
+
+    The session is meant to be shared by every request made while parsing a stream
+    of records, so that connections to the same host are reused instead of paying a
+    new TCP/TLS handshake per tweet. Resolved hostnames are cached by the connector.
+
+    Returns:
+        A new aiohttp.ClientSession. The caller is responsible for closing it.
+    """
+    connector = aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=10)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+async def get_response(
+    url: str,
+    params: Optional[dict] = None,
+    session: Optional[aiohttp.ClientSession] = None,
+    attempts: int = 3,
+    start_timeout: float = 0.5,
+) -> dict:
     """
     Sends an asynchronous GET request to the specified URL and returns the JSON response.
 
+    Timeouts, connection errors and 502/503/504 responses are retried with exponential
+    backoff on the same session, so later attempts reuse its pooled connections.
+
     Args:
         url (str): The URL to send the GET request to.
         params (dict, optional): The parameters to include in the GET request.
+        session (aiohttp.ClientSession, optional): The session to send the request with.
+            A new session is created and closed for this call if not provided.
+        attempts (int): The maximum number of attempts, including the first one.
+        start_timeout (float): The delay in seconds before the first retry, doubled on each
+            subsequent retry.
 
     Returns:
         The JSON-decoded response from the server.
@@ -37,6 +95,10 @@ async def get_response(url: str, params: Optional[dict] = None) -> dict:
         EmptyResponseError: If the response is empty.
         GetResponseError: For any other request exceptions.
     """
+    if session is None:
+        async with create_session() as session:
+            return await get_response(url, params, session, attempts, start_timeout)
+
     headers = {
         "User-Agent": (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -44,28 +106,36 @@ async def get_response(url: str, params: Optional[dict] = None) -> dict:
             "Chrome/125.0.0.0 Safari/537.36"
         )
     }
-    # Adjust the timeout as needed
-    timeout = aiohttp.ClientTimeout(total=10)
-
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        try:
-            async with session.get(url, params=params, headers=headers) as response:
-                if response.status != 200:
-                    raise HTTPError(f"HTTP error {response.status} for url: {url}")
-                data = await response.json()
-                if not data or data == []:
-                    raise EmptyResponseError("No data was saved due to an empty response.")
-                return data
-        except asyncio.TimeoutError:
-            raise ReadTimeoutError
-        except aiohttp.ClientConnectionError:
-            raise ConnectionError
-        except aiohttp.ClientResponseError:
-            raise HTTPError
-        except aiohttp.ClientError as e:
-            raise GetResponseError from e
-
 
+    try:
+        for attempt in range(attempts):
+            try:
+                async with session.get(url, params=params, headers=headers) as response:
+                    response.raise_for_status()
+                    data = await response.json(loads=json_loads)
+                break
+            except aiohttp.ClientResponseError as e:
+                if e.status not in _RETRY_STATUSES or attempt == attempts - 1:
+                    raise
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError):
+                if attempt == attempts - 1:
+                    raise
+            await asyncio.sleep(start_timeout * 2**attempt)
+    except asyncio.TimeoutError as e:
+        raise ReadTimeoutError(f"Read timeout for url: {url}") from e
+    except aiohttp.ClientConnectionError as e:
+        raise ConnectionError(f"Connection error for url: {url}") from e
+    except aiohttp.ClientResponseError as e:
+        raise HTTPError(f"HTTP error {e.status} for url: {url}") from e
+    except aiohttp.ClientError as e:
+        raise GetResponseError(f"Request failed for url: {url}") from e
+
+    if not data:
+        raise EmptyResponseError("No data was saved due to an empty response.")
+    return data
+
+
+@lru_cache(maxsize=8192)
 def clean_tweet_url(tweet_url: str, username: str) -> str:
     """
     Cleans a tweet URL by ensuring it is associated with the correct username.
@@ -78,16 +148,29 @@ def clean_tweet_url(tweet_url: str, username: str) -> str:
         The cleaned tweet URL.
     """
     tweet_lower = tweet_url.lower()
-    pattern = re.compile(r"/status/(\d+)")
-    match_lower_case = pattern.search(tweet_lower)
-    match_original_case = pattern.search(tweet_url)
+    # The status id is all digits, so lowercasing the URL never changes it.
+    match = _STATUS_RE.search(tweet_lower)
 
-    if match_lower_case and username in tweet_lower:
-        return f"https://twitter.com/{username}/status/{match_original_case.group(1)}"
+    if match and username in tweet_lower:
+        return f"https://twitter.com/{username}/status/{match.group(1)}"
     else:
         return tweet_url
 
 
+def get_tweet_id(tweet_url: str) -> Optional[str]:
+    """
+    Extracts the status id from a tweet URL.
+
+    Args:
+        tweet_url (str): The tweet URL to extract the id from.
+
+    Returns:
+        The tweet id, or None if the URL has no /status/<id> segment.
+    """
+    match = _STATUS_RE.search(tweet_url)
+    return match.group(1) if match else None
+
+
 def clean_wayback_machine_url(
     wayback_machine_url: str, archived_timestamp: str, username: str
 ) -> str:
@@ -103,8 +186,7 @@ def clean_wayback_machine_url(
         The cleaned Wayback Machine URL.
     """
     wayback_machine_url = wayback_machine_url.lower()
-    pattern = re.compile(r"/status/(\d+)")
-    match = pattern.search(wayback_machine_url)
+    match = _STATUS_RE.search(wayback_machine_url)
 
     if match and username in wayback_machine_url:
         return (
@@ -129,8 +211,7 @@ def check_pattern_tweet(tweet_url: str) -> str:
     Returns:
         Only the extracted URL from a tweet.
     """
-    pattern = r'/status/((?:"(.*?)"|&quot;(.*?)(?=&|$)|&quot%3B(.*?)(?=&|$)))'
-    match = re.search(pattern, tweet_url)
+    match = _PATTERN_TWEET_RE.search(tweet_url)
 
     if match:
         if match.group(2):
@@ -148,6 +229,7 @@ def check_pattern_tweet(tweet_url: str) -> str:
     return tweet_url
 
 
+@lru_cache(maxsize=8192)
 def delete_tweet_pathnames(tweet_url: str) -> str:
     """
     Removes any pathnames from a tweet URL.
@@ -158,11 +240,8 @@ def delete_tweet_pathnames(tweet_url: str) -> str:
     Returns:
         The tweet URL without any pathnames.
     """
-    pattern_username = re.compile(r"https://twitter\.com/([^/]+)/status/\d+")
-    match_username = pattern_username.match(tweet_url)
-
-    pattern_id = r"https://twitter.com/\w+/status/(\d+)"
-    match_id = re.search(pattern_id, tweet_url)
+    match_username = _USERNAME_RE.match(tweet_url)
+    match_id = _ID_RE.search(tweet_url)
 
     if match_id and match_username:
         tweet_id = match_id.group(1)
@@ -183,13 +262,47 @@ def check_double_status(wayback_machine_url: str, original_tweet_url: str) -> bo
     Returns:
         True if the conditions are met, False otherwise.
     """
-    if (
-        wayback_machine_url.count("/status/") == 2
-        and "twitter.com" not in original_tweet_url
-    ):
-        return True
+    first = wayback_machine_url.find("/status/")
+    if first < 0:
+        return False
+    second = wayback_machine_url.find("/status/", first + 8)
+    if second < 0 or wayback_machine_url.find("/status/", second + 8) >= 0:
+        return False
+
+    return "twitter.com" not in original_tweet_url
+
+
+def url_path(url: str) -> str:
+    """
+    Extracts the path component of a URL without building a full urlparse result.
 
-    return False
+    The path starts at the first slash after the host (the scheme is optional) and
+    ends before any query string or fragment. As with urlparse, any ;params on the
+    last segment are not part of the path.
+
+    Args:
+        url (str): The URL to extract the path from.
+
+    Returns:
+        The path of the URL, or an empty string if it has none.
+    """
+    start = url.find("://")
+    start = 0 if start < 0 else start + 3
+
+    end = len(url)
+    for delimiter in ("?", "#"):
+        index = url.find(delimiter, start, end)
+        if index >= 0:
+            end = index
+
+    start = url.find("/", start, end)
+    if start < 0:
+        return ""
+
+    params = url.find(";", url.rfind("/", start, end), end)
+    if params >= 0:
+        end = params
+    return url[start:end]
 
 
 def semicolon_parser(string: str) -> str:
@@ -202,7 +315,9 @@ def semicolon_parser(string: str) -> str:
     Returns:
         The string with semicolons replaced by %3B.
     """
-    return "".join("%3B" if c == ";" else c for c in string)
+    if ";" not in string:
+        return string
+    return string.replace(";", "%3B")
 
 
 def is_tweet_url(twitter_url: str) -> bool:
@@ -217,9 +332,11 @@ def is_tweet_url(twitter_url: str) -> bool:
     Returns:
         True if the URL is a Twitter status URL, False otherwise.
     """
-    return twitter_url.count("/status/") == 1
+    first = twitter_url.find("/status/")
+    return first >= 0 and twitter_url.find("/status/", first + 8) < 0
 
 
+@lru_cache(maxsize=4096)
 def timestamp_parser(timestamp: str) -> Optional[str]:
     """
     Parses a timestamp into a formatted string.
@@ -231,31 +348,25 @@ def timestamp_parser(timestamp: str) -> Optional[str]:
         The parsed timestamp in the format "%Y/%m/%d %H:%M:%S", or None if the
         timestamp could not be parsed.
     """
-    formats = [
-        "%Y",
-        "%Y%m",
-        "%Y%m%d",
-        "%Y%m%d%H",
-        "%Y%m%d%H%M",
-        "%Y%m%d%H%M%S",
-    ]
+    fmt = _TIMESTAMP_FORMATS.get(len(timestamp))
+    if fmt is None:
+        return None
 
-    for fmt in formats:
-        try:
-            parsed_time = datetime.strptime(timestamp, fmt)
-            return parsed_time.strftime("%Y/%m/%d %H:%M:%S")
-        except ValueError:
-            continue
-
-    return None
+    try:
+        parsed_time = datetime.strptime(timestamp, fmt)
+    except ValueError:
+        return None
+    return parsed_time.strftime("%Y/%m/%d %H:%M:%S")
 
 
 def check_url_scheme(url: str) -> str:
     """
     Corrects the URL scheme if it contains more than two slashes following the scheme.
 
-    This function uses a regular expression to find 'http:' or 'https:' followed by two or more slashes.
-    It then replaces this with the scheme followed by exactly two slashes.
+    This function finds 'http:' or 'https:' followed by three or more slashes anywhere in the
+    URL (including a scheme embedded in a Wayback Machine URL) and replaces each with the
+    scheme followed by exactly two slashes. URLs without a run of three slashes are
+    returned as is.
 
     Args:
         url (str): The URL to be corrected.
@@ -263,11 +374,19 @@ def check_url_scheme(url: str) -> str:
     Returns:
         The corrected URL.
     """
-    pattern = r"(http:|https:)(/{2,})"
+    if "///" not in url:
+        return url
+    return _URL_SCHEME_RE.sub(r"\1//", url)
+
+
+def encode_url(url: str) -> str:
+    """
+    Encodes a URL for output by replacing semicolons with %3B and correcting its scheme.
 
-    def replace_function(match):
-        scheme = match.group(1)
-        return f"{scheme}//"
+    Args:
+        url (str): The URL to encode.
 
-    parsed_url = re.sub(pattern, replace_function, url)
-    return parsed_url
+    Returns:
+        The encoded URL.
+    """
+    return check_url_scheme(semicolon_parser(url))
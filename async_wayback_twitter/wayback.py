@@ -1,7 +1,172 @@
-import json
 import aiohttp
 import asyncio
-from typing import Any, AsyncGenerator, Dict, Optional
+import logging
+import random
+from contextlib import AsyncExitStack
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from async_wayback_twitter.utils import json_loads
+
+_T = TypeVar("_T")
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_cdx_line(line: bytes) -> List[List[str]]:
+    """
+    Parses the rows contained in one line of a CDX API JSON response.
+
+    The CDX API writes its JSON array of rows with one row per line, so each line is a
+    row wrapped in the array's opening bracket, closing bracket or separating comma.
+    An empty row (which precedes the resume key when paginating) is returned as [].
+
+    Args:
+        line (bytes): A single line of the response body.
+
+    Returns:
+        List[List[str]]: The rows found on the line (usually exactly one).
+    """
+    line = line.strip().rstrip(b",")
+    if line.startswith(b"[["):
+        line = line[1:]
+    if line.endswith(b"]]"):
+        line = line[:-1]
+    if line in (b"", b"[", b"]"):
+        return []
+    return json_loads(b"[" + line + b"]")
+
+
+async def _iter_cdx_rows(
+    content: aiohttp.StreamReader,
+) -> AsyncGenerator[List[str], None]:
+    """
+    Yields CDX rows from a response body as its lines arrive.
+
+    Args:
+        content (aiohttp.StreamReader): The body of a CDX API JSON response.
+
+    Yields:
+        List[str]: Each row of the response, starting with the header row.
+    """
+    # Pieces of the current, not yet terminated line.
+    pending: List[bytes] = []
+    async for chunk in content.iter_any():
+        if b"\n" not in chunk:
+            pending.append(chunk)
+            continue
+        lines = chunk.split(b"\n")
+        pending.append(lines[0])
+        lines[0] = b"".join(pending)
+        pending = [lines.pop()]
+        for line in lines:
+            for row in _parse_cdx_line(line):
+                yield row
+    for row in _parse_cdx_line(b"".join(pending)):
+        yield row
+
+
+async def _merge(*iterables: AsyncIterator[_T]) -> AsyncGenerator[_T, None]:
+    """
+    Yields items from several async iterables concurrently, in the order they arrive.
+
+    Args:
+        *iterables (AsyncIterator): The async iterables to consume.
+
+    Yields:
+        Each item produced by any of the iterables. An exception raised by one of them
+        is re-raised here.
+    """
+    queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=1024)
+    finished = object()
+
+    async def drain(iterable: AsyncIterator[_T]) -> None:
+        try:
+            async for item in iterable:
+                await queue.put(item)
+        except Exception as e:
+            await queue.put(e)
+        await queue.put(finished)
+
+    tasks = [asyncio.create_task(drain(iterable)) for iterable in iterables]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await queue.get()
+            if item is finished:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        # The consumer may stop early; stop the remaining producers with it.
+        for task in tasks:
+            task.cancel()
+
+
+# The body is streamed inside the request, so there is no overall timeout: a large
+# account's CDX stream may take minutes. Only a stalled connect or read fails the
+# attempt, and failed attempts are retried on transient errors.
+_CDX_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=30)
+_CDX_ATTEMPTS = 5
+
+
+def _capture_key(timestamp: str, original: str) -> int:
+    """
+    Hashes a capture's timestamp and original URL, leaving out the URL's scheme and host.
+
+    The twitter.com and x.com queries list the same tweet under different hosts, so
+    only the rest of the URL (path and query string) is compared.
+
+    Args:
+        timestamp (str): The capture's timestamp.
+        original (str): The capture's original URL.
+
+    Returns:
+        int: The key stored in the `seen` set.
+    """
+    start = original.find("://")
+    start = 0 if start < 0 else start + 3
+    start = original.find("/", start)
+    return hash((timestamp, original[start:] if start >= 0 else original))
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """
+    Checks whether a failed CDX request is worth retrying.
+
+    Connection errors, timeouts, rate limiting (429) and server errors (5xx) are
+    retried; other HTTP errors such as a bad query (400) are not.
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    return True
+
+
+def create_cdx_session() -> aiohttp.ClientSession:
+    """
+    Creates an aiohttp session for CDX API requests.
+
+    Connections to web.archive.org are kept alive between requests and its address is
+    cached, so repeated queries skip the TCP/TLS handshake and DNS lookup.
+
+    Returns:
+        A new aiohttp.ClientSession. The caller is responsible for closing it.
+    """
+    connector = aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=30)
+    return aiohttp.ClientSession(connector=connector)
 
 
 class WaybackTweets:
@@ -17,8 +182,37 @@ class WaybackTweets:
         limit (Optional[int]): Maximum number of results to return.
         offset (Optional[int]): Number of lines to skip in the results.
         matchtype (Optional[str]): Match type (e.g., prefix, host, or domain).
+        page_size (Optional[int]): Number of results to request per page. If provided, the
+            results are fetched page by page with the CDX resume key instead of in a single
+            response. Cannot be combined with limit.
+        fields (Optional[Sequence[str]]): CDX columns to request (e.g., timestamp, original).
+            Unrequested columns are dropped by the server, shrinking the response, and each
+            record only holds these keys. All columns are returned if not provided;
+            WaybackTweetsParser needs all of them.
+        domains (Sequence[str]): The domains whose status URLs are queried, one CDX query
+            per domain. Defaults to both twitter.com and x.com.
+        session (Optional[aiohttp.ClientSession]): A session to send requests with, so that
+            callers fetching several usernames can share one connection pool. If not
+            provided, each get_tweets() call opens and closes its own session.
     """
 
+    # stream_many() creates an instance per username, so they carry no __dict__.
+    __slots__ = (
+        "username",
+        "collapse",
+        "timestamp_from",
+        "timestamp_to",
+        "limit",
+        "offset",
+        "matchtype",
+        "page_size",
+        "fields",
+        "domains",
+        "session",
+        "_extra",
+        "_urls",
+    )
+
     def __init__(
         self,
         username: str,
@@ -28,7 +222,14 @@ class WaybackTweets:
         limit: Optional[int] = None,
         offset: Optional[int] = None,
         matchtype: Optional[str] = None,
+        page_size: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+        domains: Sequence[str] = ("twitter.com", "x.com"),
+        session: Optional[aiohttp.ClientSession] = None,
     ):
+        if limit and page_size:
+            raise ValueError("limit and page_size cannot be combined")
+
         self.username = username
         self.collapse = collapse
         self.timestamp_from = timestamp_from
@@ -36,6 +237,82 @@ class WaybackTweets:
         self.limit = limit
         self.offset = offset
         self.matchtype = matchtype
+        self.page_size = page_size
+        self.fields = fields
+        self.domains = domains
+        self.session = session
+
+        # The configuration is fixed, so the query parameters shared by every request
+        # and the status URLs are built once here rather than per request.
+        self._extra: Dict[str, Any] = {}
+        if collapse:
+            self._extra["collapse"] = collapse
+        if timestamp_from:
+            self._extra["from"] = timestamp_from
+        if timestamp_to:
+            self._extra["to"] = timestamp_to
+        if limit:
+            self._extra["limit"] = limit
+        if offset:
+            self._extra["offset"] = offset
+        if matchtype:
+            self._extra["matchType"] = matchtype
+        if page_size:
+            self._extra["limit"] = page_size
+            self._extra["showResumeKey"] = "true"
+        if fields:
+            # timestamp and original are always fetched so that duplicate captures can
+            # still be skipped; they are projected out of the records if not requested.
+            columns = list(fields)
+            columns.extend(c for c in ("timestamp", "original") if c not in fields)
+            self._extra["fl"] = ",".join(columns)
+
+        # Use a wildcard pathname unless a matchtype is specified
+        wildcard_pathname = "/*" if not matchtype else ""
+        self._urls = tuple(
+            f"https://{domain}/{username}/status{wildcard_pathname}" for domain in domains
+        )
+
+    @classmethod
+    async def stream_many(
+        cls, usernames: Iterable[str], concurrency: int = 8, **kwargs: Any
+    ) -> AsyncGenerator[Tuple[str, Dict[str, Any]], None]:
+        """
+        Asynchronously requests the archived tweets of several usernames concurrently
+        and yields each tweet record along with its username.
+
+        All requests share one session, and at most `concurrency` usernames are fetched
+        at a time. Records from different usernames are interleaved in arrival order.
+
+        Args:
+            usernames (Iterable[str]): The Twitter usernames to search for.
+            concurrency (int): The maximum number of usernames fetched at once.
+            **kwargs: Other WaybackTweets arguments, applied to every username.
+
+        Yields:
+            Tuple[str, Dict[str, Any]]: The username and a single tweet record.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(
+            api: "WaybackTweets",
+        ) -> AsyncGenerator[Tuple[str, Dict[str, Any]], None]:
+            async with semaphore:
+                async for tweet_record in api.get_tweets():
+                    yield api.username, tweet_record
+
+        async with AsyncExitStack() as stack:
+            session = kwargs.pop("session", None)
+            if session is None:
+                session = await stack.enter_async_context(create_cdx_session())
+
+            async for item in _merge(
+                *(
+                    fetch(cls(username, session=session, **kwargs))
+                    for username in usernames
+                )
+            ):
+                yield item
 
     async def get_tweets(self) -> AsyncGenerator[Dict[str, Any], None]:
         """
@@ -47,54 +324,152 @@ class WaybackTweets:
         """
         url = "https://web.archive.org/cdx/search/cdx"
 
-        # Use a wildcard pathname unless a matchtype is specified
-        wildcard_pathname = "/*" if not self.matchtype else ""
         paramss = [
-            {
-                "url": f"https://twitter.com/{self.username}/status{wildcard_pathname}",
-                "output": "json",
-            },
-            {
-                "url": f"https://x.com/{self.username}/status{wildcard_pathname}",
-                "output": "json",
-            },
+            {"url": status_url, "output": "json", **self._extra}
+            for status_url in self._urls
         ]
-        for params in paramss:
-            if self.collapse:
-                params["collapse"] = self.collapse
-            if self.timestamp_from:
-                params["from"] = self.timestamp_from
-            if self.timestamp_to:
-                params["to"] = self.timestamp_to
-            if self.limit:
-                params["limit"] = self.limit
-            if self.offset:
-                params["offset"] = self.offset
-            if self.matchtype:
-                params["matchType"] = self.matchtype
-
-            # Optionally, you can configure a TCPConnector for concurrency or timeouts.
-            async with aiohttp.ClientSession() as session:
+
+        # Keys of the captures already yielded by any query, so a capture listed more
+        # than once (within a query, across the twitter.com and x.com queries, or again
+        # by a retried page) is only yielded once. It holds one int per yielded record,
+        # so it grows with the number of records in the stream.
+        seen: Set[int] = set()
+
+        # The per-domain queries run concurrently over one session, and records are
+        # yielded from whichever response delivers them first.
+        async with AsyncExitStack() as stack:
+            session = self.session
+            if session is None:
+                session = await stack.enter_async_context(create_cdx_session())
+
+            async for tweet_record in _merge(
+                *(
+                    self._fetch_records(session, url, params, seen)
+                    for params in paramss
+                )
+            ):
+                yield tweet_record
+
+    async def _fetch_records(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        params: Dict[str, Any],
+        seen: Set[int],
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Requests a single CDX query and yields its tweet records as they are read,
+        following the resume key from page to page when paginating.
+
+        Args:
+            session (aiohttp.ClientSession): The session to send the request with.
+            url (str): The CDX API endpoint.
+            params (Dict[str, Any]): The query parameters.
+            seen (Set[int]): Keys (see _capture_key) of the captures already yielded;
+                rows matching one are skipped, and new ones are added.
+
+        Yields:
+            Dict[str, Any]: A dictionary representing a single tweet record.
+
+        Raises:
+            aiohttp.ClientError: If the request still fails after retrying, or fails with
+                a non-retryable status.
+            asyncio.TimeoutError: If the request still times out after retrying.
+        """
+        page_params = params
+        while True:
+            resume_key: Optional[str] = None
+            yielded = False
+            # Kept across attempts: a retry that fails before its header row arrives
+            # still knows from an earlier attempt whether `seen` can filter repeats.
+            timestamp_index = original_index = -1
+            for attempt in range(_CDX_ATTEMPTS):
                 try:
-                    async with session.get(url, params=params) as response:
+                    async with session.get(
+                        url, params=page_params, timeout=_CDX_TIMEOUT
+                    ) as response:
                         response.raise_for_status()
-                        data = await response.json()
-                except aiohttp.ClientError as e:
-                    # Log error or raise a custom exception if needed
-                    print(f"[Error] Unable to fetch data: {e}")
-                    return
-
-            # The first row is typically a header row; subsequent rows are tweet records.
-            if not data or len(data) < 2:
-                # No tweet data available
+
+                        # Rows are yielded as they are read instead of after buffering
+                        # the whole response. The first row is the header row;
+                        # subsequent rows are tweet records.
+                        headers: Optional[List[str]] = None
+                        projection: Tuple[Tuple[str, int], ...] = ()
+                        end_of_records = False
+                        async for row in _iter_cdx_rows(response.content):
+                            if headers is None:
+                                # An empty header row is the API's reply when
+                                # nothing matched the query.
+                                if not row:
+                                    break
+                                headers = row
+                                if "timestamp" in headers and "original" in headers:
+                                    timestamp_index = headers.index("timestamp")
+                                    original_index = headers.index("original")
+                                else:
+                                    timestamp_index = original_index = -1
+                                # Resolve the requested columns' indices once per page
+                                # rather than looking them up in every row.
+                                if self.fields and list(self.fields) != headers:
+                                    projection = tuple(
+                                        (field, headers.index(field))
+                                        for field in self.fields
+                                    )
+                                continue
+
+                            # When paginating, an empty row separates the records
+                            # from a final row holding the next page's resume key.
+                            if not row:
+                                end_of_records = True
+                                continue
+                            if end_of_records:
+                                resume_key = row[0]
+                                continue
+
+                            if timestamp_index >= 0:
+                                key = _capture_key(
+                                    row[timestamp_index], row[original_index]
+                                )
+                                if key in seen:
+                                    continue
+                                seen.add(key)
+
+                            # Build a dictionary for each tweet record (zipping headers and row values)
+                            yielded = True
+                            if projection:
+                                yield {field: row[i] for field, i in projection}
+                            else:
+                                yield dict(zip(headers, row))
+                    break
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    # A retry restarts the page from its first row, which is only safe
+                    # once rows have been yielded if `seen` can filter the repeats out.
+                    resumable = not yielded or timestamp_index >= 0
+                    if (
+                        attempt == _CDX_ATTEMPTS - 1
+                        or not resumable
+                        or not _is_retryable(e)
+                    ):
+                        raise
+                    # The type name is logged too, as a timeout's message is empty.
+                    logger.warning(
+                        "CDX fetch failed, retrying url=%s params=%s err=%s: %s",
+                        url,
+                        page_params,
+                        type(e).__name__,
+                        e,
+                    )
+                    await asyncio.sleep(min(30, 2**attempt) + random.random())
+
+            if resume_key is None:
                 return
+            # The resume key already marks where the next page starts, so offset is
+            # only sent with the first request rather than skipping rows on every page.
+            page_params = {
+                **{name: value for name, value in params.items() if name != "offset"},
+                "resumeKey": resume_key,
+            }
 
-            headers = data[0]
-            for row in data[1:]:
-                # Build a dictionary for each tweet record (zipping headers and row values)
-                tweet_record = dict(zip(headers, row))
-                yield tweet_record
-                
 
 # Example usage of the asynchronous generator:
 async def main():
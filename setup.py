@@ -1,5 +1,21 @@
+import os
+
 from setuptools import setup, find_packages
 
+# Set ASYNC_WAYBACK_TWITTER_COMPILE=1 to compile the URL helpers in utils.py
+# to a native extension with mypyc (requires mypy at build time).
+ext_modules = []
+if os.environ.get("ASYNC_WAYBACK_TWITTER_COMPILE") == "1":
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(
+        [
+            "--ignore-missing-imports",
+            "--follow-imports=silent",
+            "async_wayback_twitter/utils.py",
+        ]
+    )
+
 setup(
     name="async_wayback_twitter",
     version="0.1.0",
@@ -7,9 +23,16 @@ setup(
     author="Your Name",
     author_email="your.email@example.com",
     packages=find_packages(),
+    ext_modules=ext_modules,
     install_requires=[
         "aiohttp",
-        "rich",
+        "orjson",
     ],
+    extras_require={
+        # aiohttp's speedups add Brotli response decoding and the aiodns resolver.
+        "speedups": ["aiohttp[speedups]"],
+        # rich only colours the error messages printed while parsing.
+        "cli": ["rich"],
+    },
     python_requires=">=3.7",
 )
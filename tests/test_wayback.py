@@ -0,0 +1,105 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from async_wayback_twitter import wayback
+from async_wayback_twitter.wayback import WaybackTweets
+
+_HEADER = b'[["timestamp","original"]'
+_ROW = b',\n["20200101","https://twitter.com/jk_rowling/status/1"]'
+_RECORD = {
+    "timestamp": "20200101",
+    "original": "https://twitter.com/jk_rowling/status/1",
+}
+
+
+class FetchRecordsTest(unittest.IsolatedAsyncioTestCase):
+    async def fetch(self, body, seen=None, **kwargs):
+        async def handler(request):
+            return web.Response(body=body)
+
+        return await self.fetch_from(handler, seen, **kwargs)
+
+    async def fetch_from(self, handler, seen=None, **kwargs):
+        app = web.Application()
+        app.router.add_get("/cdx", handler)
+        async with TestServer(app) as server, aiohttp.ClientSession() as session:
+            api = WaybackTweets("jk_rowling", **kwargs)
+            params = {"url": api._urls[0], "output": "json", **api._extra}
+            return [
+                record
+                async for record in api._fetch_records(
+                    session,
+                    str(server.make_url("/cdx")),
+                    params,
+                    set() if seen is None else seen,
+                )
+            ]
+
+    async def test_empty_result(self):
+        self.assertEqual(await self.fetch(b"[]"), [])
+
+    async def test_empty_result_with_fields(self):
+        for fields in (("original",), ("timestamp", "original")):
+            self.assertEqual(await self.fetch(b"[]", fields=fields), [])
+
+    async def test_records(self):
+        body = b'[["timestamp","original"],\n["20200101","https://twitter.com/jk_rowling/status/1"]]\n'
+        self.assertEqual(
+            await self.fetch(body, fields=("original",)),
+            [{"original": "https://twitter.com/jk_rowling/status/1"}],
+        )
+
+    async def test_duplicates_across_domains(self):
+        seen = set()
+        twitter = _HEADER + _ROW + b"]\n"
+        x = (
+            _HEADER
+            + b',\n["20200101","https://x.com/jk_rowling/status/1"]'
+            + b',\n["20200102","https://x.com/jk_rowling/status/1"]]\n'
+        )
+        self.assertEqual(await self.fetch(twitter, seen), [_RECORD])
+        self.assertEqual(
+            await self.fetch(x, seen, domains=("x.com",)),
+            [{"timestamp": "20200102", "original": "https://x.com/jk_rowling/status/1"}],
+        )
+
+    async def test_retry_after_rows_were_yielded(self):
+        # 503, then a header and one row before the connection drops, then a body
+        # that stalls before its header row, then the full response.
+        attempts = []
+        stalled = asyncio.Event()
+
+        async def handler(request):
+            attempts.append(request)
+            if len(attempts) == 1:
+                return web.Response(status=503)
+            response = web.StreamResponse()
+            await response.prepare(request)
+            if len(attempts) == 2:
+                await response.write(_HEADER + _ROW + b"\n")
+                request.transport.close()
+            elif len(attempts) == 3:
+                await stalled.wait()
+            else:
+                await response.write(_HEADER + _ROW + b"]\n")
+            return response
+
+        real_sleep = asyncio.sleep
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=0.2)
+        with mock.patch.object(wayback, "_CDX_TIMEOUT", timeout), mock.patch(
+            "asyncio.sleep", lambda delay, *args: real_sleep(0, *args)
+        ), self.assertLogs(wayback.logger, "WARNING") as logs:
+            records = await self.fetch_from(handler)
+
+        self.assertEqual(records, [_RECORD])
+        self.assertEqual(len(attempts), 4)
+        self.assertEqual(len(logs.records), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()